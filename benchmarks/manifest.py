@@ -0,0 +1,83 @@
+# Compares one manifest run rendering a container, shelf and lid label per
+# container with the previous workflow of one CLI process per label type over
+# pre-filtered JSON files.
+#
+#     python benchmarks/manifest.py [--containers N]
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+repo_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+# Label types and the record fields each of them needs
+job_types = ("container-klt", "qr-54x17", "barcode-62x29")
+
+def make_manifest(containers):
+    manifest = []
+    for i in range(containers):
+        record = {
+            "id": f"KLT-{i:05d}",
+            "description": f"Behälter {i}: Kabel, Stecker und Adapter",
+            "url": f"https://example.org/c/KLT-{i:05d}",
+            "org": "CCCHB",
+            "pos_site": "HB",
+            "pos_rack": f"R{i % 8}",
+            "pos_slot": str(i % 40)
+        }
+        manifest.extend({**record, "label_type": label_type} for label_type in job_types)
+    return manifest
+
+def run(tmp_dir, json_name, *args):
+    subprocess.run([sys.executable, "-m", "kltrack.label",
+            "--json", os.path.join(tmp_dir, json_name),
+            "--output-file", os.path.join(tmp_dir, json_name + ".pdf"), *args],
+            cwd=repo_dir, check=True)
+
+def bench_manifest(tmp_dir, manifest, group_by_type=False):
+    with open(os.path.join(tmp_dir, "manifest.json"), "w") as json_file:
+        json.dump(manifest, json_file)
+    start = time.perf_counter()
+    run(tmp_dir, "manifest.json", *(("--group-by-type",) if group_by_type else ()))
+    return time.perf_counter() - start
+
+def bench_per_type(tmp_dir, manifest):
+    for label_type in job_types:
+        records = [{key: value for key, value in record.items() if key != "label_type"}
+                for record in manifest if record["label_type"] == label_type]
+        with open(os.path.join(tmp_dir, label_type + ".json"), "w") as json_file:
+            json.dump(records, json_file)
+    start = time.perf_counter()
+    processes = [subprocess.Popen([sys.executable, "-m", "kltrack.label",
+            "--json", os.path.join(tmp_dir, label_type + ".json"),
+            "--output-file", os.path.join(tmp_dir, label_type + ".pdf"), label_type],
+            cwd=repo_dir) for label_type in job_types]
+    for process in processes:
+        if process.wait() != 0:
+            raise subprocess.CalledProcessError(process.returncode, process.args)
+    parallel = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for label_type in job_types:
+        run(tmp_dir, label_type + ".json", label_type)
+    return parallel, time.perf_counter() - start
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("--containers", type=int, default=200)
+    args = argparser.parse_args()
+
+    manifest = make_manifest(args.containers)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        single = bench_manifest(tmp_dir, manifest)
+        grouped = bench_manifest(tmp_dir, manifest, group_by_type=True)
+        parallel, sequential = bench_per_type(tmp_dir, manifest)
+
+    labels = len(manifest)
+    for name, duration in (("manifest", single), ("manifest, grouped", grouped),
+            ("3 processes, parallel", parallel), ("3 processes, sequential", sequential)):
+        print(f"{name:24} {duration:7.2f} s  {labels / duration:8.1f} labels/s")
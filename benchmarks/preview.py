@@ -0,0 +1,59 @@
+# Times render_preview for KLTContainerLabel in three states: everything cold,
+# only the chrome cached (a new record) and a thumbnail cache hit. The target
+# for the chrome-cached case is single-digit milliseconds.
+#
+#     python benchmarks/preview.py [--runs N] [--width PIXELS]
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from kltrack.label.preview import chrome_cache, preview_cache, render_preview
+
+def make_record(i):
+    return {
+        "id": f"KLT-{i:05d}",
+        "description": f"Behälter {i}: Kabel, Stecker und Adapter",
+        "url": f"https://example.org/c/KLT-{i:05d}",
+        "org": "CCCHB",
+        "pos_site": "HB",
+        "pos_rack": "R3",
+        "pos_slot": str(i % 40)
+    }
+
+def bench(runs, width, setup):
+    durations = []
+    for i in range(runs):
+        record = setup(i)
+        start = time.perf_counter()
+        render_preview("container-klt", record, width)
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    return durations[len(durations) // 2], durations[int(len(durations) * 0.95)]
+
+def cold(i):
+    chrome_cache.clear()
+    preview_cache.clear()
+    return make_record(i)
+
+def chrome_only(i):
+    preview_cache.clear()
+    return make_record(i)
+
+def hit(i):
+    return make_record(0)
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("--runs", type=int, default=200)
+    argparser.add_argument("--width", type=int, default=400)
+    args = argparser.parse_args()
+
+    # Construct the label instance outside of the measurements
+    render_preview("container-klt", make_record(0), args.width, cache=None)
+    for name, setup in (("cold", cold), ("chrome cached", chrome_only), ("cache hit", hit)):
+        median, p95 = bench(args.runs, args.width, setup)
+        print(f"{name:14} median {median * 1_000:7.2f} ms  p95 {p95 * 1_000:7.2f} ms")
@@ -0,0 +1,66 @@
+# Compares rendering a single label in-process through render_batch with
+# spawning the CLI for it, as the inventory web service used to do.
+#
+#     python benchmarks/single_label.py [--runs N] [label_type]
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+repo_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, repo_dir)
+
+from kltrack.label.render import label_types, render_batch
+
+record = {
+    "id": "KLT-00042",
+    "description": "M3 Schrauben, Muttern und Unterlegscheiben",
+    "url": "https://example.org/c/KLT-00042",
+    "org": "CCCHB",
+    "pos_site": "HB",
+    "pos_rack": "R3",
+    "pos_slot": "12",
+    "policy": "Öffentlich",
+    "responsible_person": "Inventur"
+}
+
+def bench_in_process(label_type, runs):
+    # The first call constructs the label instance, as a long-running service
+    # would do once at startup.
+    render_batch(label_type, [record], io.BytesIO())
+    start = time.perf_counter()
+    for _ in range(runs):
+        render_batch(label_type, [record], io.BytesIO())
+    return (time.perf_counter() - start) / runs
+
+def bench_subprocess(label_type, runs):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, "record.json")
+        output_path = os.path.join(tmp_dir, "out.pdf")
+        start = time.perf_counter()
+        for _ in range(runs):
+            with open(json_path, "w") as json_file:
+                json.dump(record, json_file)
+            subprocess.run([sys.executable, "-m", "kltrack.label",
+                    "--json", json_path, "--output-file", output_path, label_type],
+                    cwd=repo_dir, check=True)
+            with open(output_path, "rb") as output_file:
+                output_file.read()
+        return (time.perf_counter() - start) / runs
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("--runs", type=int, default=20)
+    argparser.add_argument("label_type", nargs="?", default="container-klt",
+            choices=tuple(label_types))
+    args = argparser.parse_args()
+
+    in_process = bench_in_process(args.label_type, args.runs)
+    spawned = bench_subprocess(args.label_type, args.runs)
+    print(f"in-process: {in_process * 1_000:8.2f} ms/label")
+    print(f"subprocess: {spawned * 1_000:8.2f} ms/label ({spawned / in_process:.1f}x)")
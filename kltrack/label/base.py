@@ -10,6 +10,81 @@ import enum
 
 in_mm = lambda mms: mms * 720 / 254
 
+def _merge_intervals(intervals):
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+# Border lines of a label, collected in label coordinates. All lines of the
+# same width are stroked as a single path, and overlapping horizontal and
+# vertical lines (e.g. the shared edge of two adjacent fields) are merged
+# first, so that every edge is drawn exactly once.
+class Frame(object):
+    def __init__(self):
+        self._lines = {}
+        self._paths = None
+
+    @classmethod
+    def from_fields(cls, fields):
+        frame = cls()
+        for field in fields:
+            if field.show_borders:
+                field.add_border(frame, field.position_x, field.position_y)
+        return frame
+
+    def add_line(self, x0, y0, x1, y1, line_width):
+        self._lines.setdefault(line_width, set()).add((x0, y0, x1, y1))
+        self._paths = None
+
+    def add_rectangle(self, x, y, width, height, line_width):
+        self.add_line(x, y, x + width, y, line_width)
+        self.add_line(x, y + height, x + width, y + height, line_width)
+        self.add_line(x, y, x, y + height, line_width)
+        self.add_line(x + width, y, x + width, y + height, line_width)
+
+    def _merge(self, lines):
+        horizontal, vertical, other = {}, {}, []
+        for x0, y0, x1, y1 in lines:
+            if y0 == y1:
+                horizontal.setdefault(y0, []).append((min(x0, x1), max(x0, x1)))
+            elif x0 == x1:
+                vertical.setdefault(x0, []).append((min(y0, y1), max(y0, y1)))
+            else:
+                other.append((x0, y0, x1, y1))
+        path = []
+        for y, intervals in sorted(horizontal.items()):
+            path.extend((x0, y, x1, y) for x0, x1 in _merge_intervals(intervals))
+        for x, intervals in sorted(vertical.items()):
+            path.extend((x, y0, x, y1) for y0, y1 in _merge_intervals(intervals))
+        path.extend(sorted(other))
+        return path
+
+    @property
+    def paths(self):
+        if self._paths is None:
+            self._paths = {line_width: self._merge(lines)
+                    for line_width, lines in self._lines.items()}
+        return self._paths
+
+    def render(self, ctx):
+        ctx.save()
+        try:
+            # Square caps close the corners where merged lines meet, just like
+            # the miter joins of a rectangle would.
+            ctx.set_line_cap(cairo.LINE_CAP_SQUARE)
+            for line_width, path in self.paths.items():
+                for x0, y0, x1, y1 in path:
+                    ctx.move_to(x0, y0)
+                    ctx.line_to(x1, y1)
+                ctx.set_line_width(line_width)
+                ctx.stroke()
+        finally:
+            ctx.restore()
+
 class BaseField(object):
     position_x: float
     position_y: float
@@ -61,10 +136,13 @@ class BaseField(object):
     def padding_bottom(self):
         return self.padding[2]
 
+    def add_border(self, frame, offset_x=0, offset_y=0):
+        frame.add_rectangle(offset_x, offset_y, self.width, self.height, self.border_width)
+
     def render_border(self, ctx):
-        ctx.rectangle(0, 0, self.width, self.height)
-        ctx.set_line_width(self.border_width)
-        ctx.stroke()
+        frame = Frame()
+        self.add_border(frame)
+        frame.render(ctx)
 
     def render_label(self, ctx):
         layout = PangoCairo.create_layout(ctx)
@@ -76,8 +154,10 @@ class BaseField(object):
     def render_data(self, ctx, data):
         return NotImplemented
 
-    def render(self, ctx):
-        if self.show_borders:
+    def render(self, ctx, borders=True):
+        # Labels pass borders=False when they draw all borders at once through
+        # a Frame.
+        if borders and self.show_borders:
             self.render_border(ctx)
         if self.label_text:
             self.render_label(ctx)
@@ -87,6 +167,22 @@ class BaseField(object):
         if data is not None:
             self.render_data(ctx, data)
 
+class BaseLabel(object):
+    width: float
+    height: float
+
+    def render_chrome(self, ctx):
+        # Borders and field labels, which do not depend on the data
+        pass
+
+    def render_data(self, ctx, data):
+        pass
+
+    def render(self, ctx, data=None):
+        self.render_chrome(ctx)
+        if data is not None:
+            self.render_data(ctx, data)
+
 class Alignment(enum.Enum):
     LEFT = enum.auto()
     TOP = LEFT
@@ -202,24 +298,21 @@ class SplitField(BaseField):
             finally:
                 ctx.restore()
 
-    def render_border(self, ctx):
-        super().render_border(ctx)
+    def add_border(self, frame, offset_x=0, offset_y=0):
+        super().add_border(frame, offset_x, offset_y)
         for sub_field in self.sub_fields:
-            ctx.save()
-            try:
-                ctx.translate(sub_field.position_x, sub_field.position_y)
-                if sub_field.show_borders:
-                    sub_field.render_border(ctx)
-                ctx.move_to(sub_field.width, self.height)
-                ctx.line_to(sub_field.width, self.height - 4_000)
-                ctx.set_line_width(self.border_width)
-                ctx.stroke()
-            finally:
-                ctx.restore()
-
-    def render(self, ctx):
+            sub_x = offset_x + sub_field.position_x
+            sub_y = offset_y + sub_field.position_y
+            if sub_field.show_borders:
+                sub_field.add_border(frame, sub_x, sub_y)
+            frame.add_line(sub_x + sub_field.width, sub_y + self.height,
+                    sub_x + sub_field.width, sub_y + self.height - 4_000,
+                    self.border_width)
+
+    def render(self, ctx, borders=True):
         self.render_label(ctx)
-        self.render_border(ctx)
+        if borders and self.show_borders:
+            self.render_border(ctx)
 
 class QRCodeField(BaseField):
     def __init__(self, *args, qr_parameters={"micro": False, "error": "Q"}, quiet_zone=8,
@@ -383,5 +476,5 @@ class ImageField(BaseField):
         finally:
             ctx.restore()
 
-__all__ = ("BaseField", "TextField", "QRCodeField", "BarcodeField",
+__all__ = ("Frame", "BaseLabel", "BaseField", "TextField", "QRCodeField", "BarcodeField",
         "ImageField", "SplitField", "in_mm", "Alignment", "DataMatrixField")
@@ -3,7 +3,7 @@ from .base import *
 from gi.repository import Pango
 import cairo
 
-class KLTContainerLabel(object):
+class KLTContainerLabel(BaseLabel):
     width = 210_000
     height = 74_000
 
@@ -90,8 +90,22 @@ class KLTContainerLabel(object):
             **font_settings)
         self._logo_field = ImageField(5_000, 2_000, 30_000, 30_000,
             label_font=label_font)
+        self._fields = (self._position_field, self._policy_field, self._id_field,
+            self._id_barcode_field, self._url_field, self._description_field,
+            self._org_field, self._logo_field)
+        self._frame = Frame.from_fields(self._fields)
 
-    def render(self, ctx, data):
+    def render_chrome(self, ctx):
+        self._frame.render(ctx)
+        for field in self._fields:
+            ctx.save()
+            try:
+                ctx.translate(field.position_x, field.position_y)
+                field.render(ctx, borders=False)
+            finally:
+                ctx.restore()
+
+    def render_data(self, ctx, data):
         fields = (
             (self._position_field, (data.get("pos_site"), data.get("pos_rack"), data.get("pos_slot"))),
             (self._policy_field, (data.get("policy"), data.get("responsible_person"))),
@@ -106,13 +120,12 @@ class KLTContainerLabel(object):
             ctx.save()
             try:
                 ctx.translate(field.position_x, field.position_y)
-                field.render(ctx)
                 if field_data is not None:
                     field.render_data(ctx, field_data)
             finally:
                 ctx.restore()
 
-class DataMatrixLabel(object):
+class DataMatrixLabel(BaseLabel):
     def __init__(self, width, height, data_fonts=None, font_family="Fira Sans"):
         self.width = width
         self.height = height
@@ -148,7 +161,7 @@ class DataMatrixLabel(object):
                 alignment=Alignment.CENTER,
                 vertical_alignment=Alignment.TOP)
         
-    def render(self, ctx, data):
+    def render_data(self, ctx, data):
         fields = (
                 (self._dmtx_field, data.get("url") or data.get("full_id") or data.get("id")),
                 (self._id_field, data.get("id")),
@@ -163,7 +176,7 @@ class DataMatrixLabel(object):
             finally:
                 ctx.restore()
 
-class QRCodeLabel(object):
+class QRCodeLabel(BaseLabel):
     def __init__(self, width, height, data_fonts=None, font_family="Fira Sans"):
         self.width = width
         self.height = height
@@ -200,7 +213,7 @@ class QRCodeLabel(object):
                 alignment=Alignment.CENTER,
                 vertical_alignment=Alignment.TOP)
     
-    def render(self, ctx, data):
+    def render_data(self, ctx, data):
         fields = (
                 (self._qrcode_field, data.get("url") or data.get("full_id") or data.get("id")),
                 (self._id_field, data.get("id")),
@@ -215,7 +228,7 @@ class QRCodeLabel(object):
             finally:
                 ctx.restore()
 
-class BarcodeLabel(object):
+class BarcodeLabel(BaseLabel):
     def __init__(self, width, height, barcode_height=6_000, data_font=None, font_family="Fira Sans"):
         self.width = width
         self.height = height
@@ -243,7 +256,7 @@ class BarcodeLabel(object):
                 vertical_alignment=Alignment.CENTER,
                 padding=(3_000, 3_000, 0, 3_000))
 
-    def render(self, ctx, data):
+    def render_data(self, ctx, data):
         fields = [
             (self._barcode_field, data.get("id")),
             (self._id_field, data.get("full_id") or data.get("id"))
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+
+from .render import BatchStats, label_types, page_offsets, render_batch
+
+# A job renders its records in segments of segment_size records. Every segment
+# is written to its own PDF file in the job directory, and only after that file
+# is complete, a line describing it is appended to the journal. A restarted job
+# skips all segments found in the journal whose files are still intact and
+# finally concatenates the segment files into the output.
+#
+# The first line of the journal holds the job parameters, so that a job
+# directory cannot be resumed with different ones. Later entries for the same
+# segment (after a segment had to be rendered again) replace earlier ones.
+
+journal_name = "journal.jsonl"
+
+def _records_digest(records):
+    encoded = json.dumps(records, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+def _page_data(record):
+    return {key: value for key, value in record.items() if key != "copies"}
+
+def _segments(records, segment_size):
+    # Runs of identical records are never split across segments, so that
+    # duplicates are collapsed exactly like in a single render_batch() call.
+    # A segment may therefore hold more than segment_size records.
+    segment = []
+    for record in records:
+        if len(segment) >= segment_size and _page_data(record) != _page_data(segment[-1]):
+            yield segment
+            segment = []
+        segment.append(record)
+    if segment:
+        yield segment
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as in_file:
+        for chunk in iter(lambda: in_file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _sync_dir(path):
+    # Make renames and newly created files in path survive a crash of the host
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def read_journal(job_dir):
+    journal_path = os.path.join(job_dir, journal_name)
+    header = None
+    segments = {}
+    valid_length = 0
+    try:
+        with open(journal_path, "rb") as journal:
+            for line in journal:
+                # A job killed while appending leaves an incomplete last line
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if header is None:
+                    header = entry
+                else:
+                    segments[entry["segment"]] = entry
+                valid_length += len(line)
+    except FileNotFoundError:
+        return header, segments
+    if os.path.getsize(journal_path) != valid_length:
+        os.truncate(journal_path, valid_length)
+    return header, segments
+
+def _append_journal(job_dir, entry):
+    with open(os.path.join(job_dir, journal_name), "a") as journal:
+        journal.write(json.dumps(entry, sort_keys=True) + "\n")
+        journal.flush()
+        os.fsync(journal.fileno())
+
+def _segment_intact(job_dir, entry):
+    path = os.path.join(job_dir, entry["file"])
+    try:
+        if os.path.getsize(path) != entry["file_size"]:
+            return False
+    except FileNotFoundError:
+        return False
+    return _file_digest(path) == entry["file_digest"]
+
+def _render_segment(job_dir, segment, label_type, records, **kwargs):
+    file_name = f"segment-{segment:06d}.pdf"
+    path = os.path.join(job_dir, file_name)
+    with open(path + ".tmp", "wb") as segment_file:
+        stats = render_batch(label_type, records, segment_file, format="pdf", **kwargs)
+        segment_file.flush()
+        os.fsync(segment_file.fileno())
+    os.replace(path + ".tmp", path)
+    _sync_dir(job_dir)
+    return file_name, stats
+
+def _concatenate(job_dir, entries, sink):
+    # The segment pages are copied into the output as they are, without
+    # rendering them again.
+    import pypdf
+
+    writer = pypdf.PdfWriter()
+    for entry in entries:
+        writer.append(os.path.join(job_dir, entry["file"]))
+    writer.write(sink)
+
+def _write_output(job_dir, label_type, size, entries, sink):
+    entries = [entry for entry in entries if entry["rendered"] + entry["duplicated"]]
+    if entries:
+        _concatenate(job_dir, entries, sink)
+    else:
+        render_batch(label_type, (), sink, format="pdf", size=size)
+
+def render_job(label_type, records, sink, job_dir, segment_size=1_000,
+        size="raw", fields=None):
+    if segment_size < 1:
+        raise ValueError(f"Segment size must be at least 1, not {segment_size}")
+    if label_type is not None and label_type not in label_types:
+        raise ValueError(f"Unknown label type {label_type!r}")
+    if size not in page_offsets:
+        raise ValueError(f"Unknown size {size!r}")
+
+    os.makedirs(job_dir, exist_ok=True)
+    header, segments = read_journal(job_dir)
+    job = {
+        "label_type": label_type,
+        "size": size,
+        "fields": fields or {},
+        "format": "pdf",
+        "segment_size": segment_size
+    }
+    if header is None:
+        _append_journal(job_dir, {"job": job})
+        _sync_dir(job_dir)
+    elif header.get("job") != json.loads(json.dumps(job)):
+        raise ValueError(f"Job parameters do not match the journal of job {job_dir!r}")
+
+    stats = BatchStats()
+    entries = []
+    for segment, segment_records in enumerate(_segments(records, segment_size)):
+        digest = _records_digest(segment_records)
+
+        entry = segments.get(segment)
+        if entry is not None and (entry["digest"] != digest
+                or entry["first_record"] != stats.records):
+            raise ValueError(f"Input does not match the journal of job {job_dir!r} "
+                    f"at record {stats.records}")
+        if entry is None or not _segment_intact(job_dir, entry):
+            file_name, segment_stats = _render_segment(job_dir, segment, label_type,
+                    segment_records, size=size, fields=fields)
+            path = os.path.join(job_dir, file_name)
+            entry = {
+                "segment": segment,
+                "file": file_name,
+                "file_size": os.path.getsize(path),
+                "file_digest": _file_digest(path),
+                "digest": digest,
+                "first_record": stats.records,
+                "records": segment_stats.records,
+                "first_page": stats.pages,
+                "rendered": segment_stats.rendered,
+                "duplicated": segment_stats.duplicated
+            }
+            _append_journal(job_dir, entry)
+        entries.append(entry)
+        stats.records += entry["records"]
+        stats.rendered += entry["rendered"]
+        stats.duplicated += entry["duplicated"]
+
+    if any(journal_segment >= len(entries) for journal_segment in segments):
+        raise ValueError(f"Input of job {job_dir!r} ends before its journal does")
+
+    # Like render_batch, render_job writes to paths as well as file-like
+    # objects. A path is replaced atomically, so that it either does not exist
+    # or is complete.
+    if isinstance(sink, (str, os.PathLike)):
+        sink = os.fspath(sink)
+        tmp_path = sink + ".tmp"
+        with open(tmp_path, "wb") as out_file:
+            _write_output(job_dir, label_type, size, entries, out_file)
+            out_file.flush()
+            os.fsync(out_file.fileno())
+        os.replace(tmp_path, sink)
+    else:
+        _write_output(job_dir, label_type, size, entries, sink)
+    return stats
+
+__all__ = ("render_job", "read_journal")
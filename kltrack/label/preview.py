@@ -0,0 +1,113 @@
+import collections
+import hashlib
+import io
+import json
+import threading
+
+import cairo
+
+from .render import get_label, label_types
+
+# Shared between the threads of a web service, hence the lock
+class PreviewCache(object):
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            preview = self._entries.get(key)
+            if preview is not None:
+                self._entries.move_to_end(key)
+            return preview
+
+    def put(self, key, preview):
+        with self._lock:
+            self._entries[key] = preview
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+preview_cache = PreviewCache()
+
+def record_hash(record):
+    encoded = json.dumps(record, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+max_width = 4_096
+
+# Rendered borders and field labels ("chrome") per label type and pixel width.
+# They do not depend on the record, so every preview starts from a copy.
+chrome_cache = PreviewCache(max_entries=32)
+
+def _create_context(surface, scale):
+    # Previews are small, so cheap antialiasing is indistinguishable from the
+    # default. Hinting stays off to keep the text layout identical to the
+    # printed label.
+    font_options = cairo.FontOptions()
+    font_options.set_antialias(cairo.ANTIALIAS_GRAY)
+    font_options.set_hint_style(cairo.HINT_STYLE_NONE)
+    font_options.set_hint_metrics(cairo.HINT_METRICS_OFF)
+
+    ctx = cairo.Context(surface)
+    ctx.set_antialias(cairo.ANTIALIAS_FAST)
+    ctx.set_font_options(font_options)
+    ctx.scale(scale, scale)
+    return ctx
+
+def _get_chrome(label_type, width):
+    chrome = chrome_cache.get((label_type, width))
+    if chrome is None:
+        label = get_label(label_type)
+        height = max(1, round(width * label.height / label.width))
+        chrome = cairo.ImageSurface(cairo.FORMAT_RGB24, width, height)
+        ctx = _create_context(chrome, width / label.width)
+        ctx.set_source_rgb(1, 1, 1)
+        ctx.paint()
+        ctx.set_source_rgb(0, 0, 0)
+        label.render_chrome(ctx)
+        chrome.flush()
+        chrome_cache.put((label_type, width), chrome)
+    return chrome
+
+def render_preview(label_type, record, width, cache=preview_cache):
+    if not isinstance(width, int) or isinstance(width, bool) or not 0 < width <= max_width:
+        raise ValueError(f"Preview width must be an integer between 1 and {max_width}")
+    if label_type not in label_types:
+        raise ValueError(f"Unknown label type {label_type!r}")
+    key = (label_type, width, record_hash(record))
+    if cache is not None:
+        preview = cache.get(key)
+        if preview is not None:
+            return preview
+
+    label = get_label(label_type)
+    chrome = _get_chrome(label_type, width)
+    surface = cairo.ImageSurface(cairo.FORMAT_RGB24, chrome.get_width(), chrome.get_height())
+    ctx = cairo.Context(surface)
+    ctx.set_source_surface(chrome, 0, 0)
+    ctx.paint()
+    del ctx
+
+    ctx = _create_context(surface, width / label.width)
+    ctx.set_source_rgb(0, 0, 0)
+    label.render_data(ctx, record)
+    surface.flush()
+
+    buf = io.BytesIO()
+    surface.write_to_png(buf)
+    preview = buf.getvalue()
+    if cache is not None:
+        cache.put(key, preview)
+    return preview
+
+__all__ = ("PreviewCache", "preview_cache", "chrome_cache", "record_hash", "render_preview")
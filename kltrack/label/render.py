@@ -0,0 +1,157 @@
+import cairo
+
+from .ccchb import *
+from .vda import *
+
+label_types = {
+    "container-klt": KLTContainerLabel,
+    "barcode-62x29": lambda: BarcodeLabel(62_000, 29_000),
+    "barcode-90x38": lambda: BarcodeLabel(90_000, 38_000),
+    "barcode-54x17": lambda: BarcodeLabel(54_000, 17_000),
+    "qr-62x29": lambda: QRCodeLabel(62_000, 29_000),
+    "qr-54x17": lambda: QRCodeLabel(54_000, 17_000),
+    "qr-90x38": lambda: QRCodeLabel(90_000, 38_000),
+    "dmtx-54x17": lambda: DataMatrixLabel(54_000, 17_000),
+    "klt": KLTLabel,
+    "gtl-klt": GTLKLTLabel
+}
+
+# Page sizes and the offset of the label on the page, both in the module's
+# base unit (micrometers). "raw" pages have exactly the size of the label.
+page_sizes = {
+    "a4": (210_000, 296_000),
+    "a5": (210_000, 148_000),
+}
+page_offsets = {
+    "raw": (0, 0),
+    "a4": (0, 148_000),
+    "a5": (0, 3_000),
+}
+
+surface_types = {
+    "pdf": cairo.PDFSurface,
+    "svg": cairo.SVGSurface,
+}
+
+to_points = lambda length: length * 720 / (254 * 1_000)
+
+# Label instances are expensive to construct (fonts, field layout), so we keep
+# one per label type around for the lifetime of the process.
+_labels = {}
+
+def get_label(label_type):
+    label = _labels.get(label_type)
+    if label is None:
+        label = _labels[label_type] = label_types[label_type]()
+    return label
+
+def page_size(label, size="raw"):
+    if size == "raw":
+        return label.width, label.height
+    return page_sizes[size]
+
+class BatchStats(object):
+    def __init__(self):
+        self.records = 0
+        self.rendered = 0
+        self.duplicated = 0
+
+    @property
+    def pages(self):
+        return self.rendered + self.duplicated
+
+    def __repr__(self):
+        return (f"BatchStats(records={self.records}, pages={self.pages}, "
+                f"rendered={self.rendered}, duplicated={self.duplicated})")
+
+def _default_page_size(label_type, size):
+    if label_type is not None:
+        return page_size(get_label(label_type), size)
+    return page_sizes.get(size, page_sizes["a4"])
+
+def _pages(label_type, size, records, fields):
+    # Without a label type ("manifest mode"), every record names its label type
+    # through the "label_type" field and may name its page size through
+    # "size". Otherwise these fields belong to the record's data.
+    for index, record in enumerate(records):
+        record = {**record, **(fields or {})}
+        record_type, record_size = label_type, size
+        if label_type is None:
+            record_type = record.pop("label_type", None)
+            record_size = record.pop("size", size)
+        if record_type is None:
+            raise ValueError(f"No label type given for record {index}")
+        if record_type not in label_types:
+            raise ValueError(f"Unknown label type {record_type!r} in record {index}")
+        if record_size not in page_offsets:
+            raise ValueError(f"Unknown size {record_size!r} in record {index}")
+        copies = record.pop("copies", 1)
+        if isinstance(copies, str) and copies.isdecimal():
+            # Given on the command line through --field
+            copies = int(copies)
+        if isinstance(copies, bool) or not isinstance(copies, int) or copies < 0:
+            raise ValueError(f"Invalid number of copies in record {index}")
+        yield record_type, record_size, copies, record
+
+def render_batch(label_type, records, sink, format="pdf", size="raw", fields=None,
+        group_by_type=False):
+    # All records are checked before the surface is created, so that an
+    # invalid record does not leave a partial document behind in the sink.
+    pages = list(_pages(label_type, size, records, fields))
+    if group_by_type:
+        pages.sort(key=lambda page: page[0])
+    if format != "pdf":
+        # Only PDF pages can change their size
+        surface_sizes = {page_size(get_label(page[0]), page[1]) for page in pages}
+        if len(surface_sizes) > 1:
+            raise ValueError(f"Mixed page sizes are not supported for {format} output")
+
+    # The page of the last rendered record stays on the surface until a
+    # different record comes along. Copies of it, whether requested through
+    # the "copies" field or caused by consecutive identical records, are
+    # emitted with copy_page() instead of being rendered again.
+    stats = BatchStats()
+    surface = ctx = None
+    current = current_size = None
+    for record_type, record_size, copies, record in pages:
+        label = get_label(record_type)
+        page = (record_type, record_size, record)
+        stats.records += 1
+        for _ in range(copies):
+            if page == current:
+                ctx.copy_page()
+                stats.duplicated += 1
+                continue
+            if current is not None:
+                ctx.show_page()
+
+            surface_size = page_size(label, record_size)
+            if surface is None:
+                surface = surface_types[format](sink, *map(to_points, surface_size))
+                ctx = cairo.Context(surface)
+                ctx.scale(to_points(1), to_points(1))
+            elif surface_size != current_size:
+                surface.set_size(*map(to_points, surface_size))
+
+            ctx.save()
+            try:
+                ctx.translate(*page_offsets[record_size])
+                label.render(ctx, record)
+            finally:
+                ctx.restore()
+            current, current_size = page, surface_size
+            stats.rendered += 1
+    if current is not None:
+        ctx.show_page()
+
+    if surface is None:
+        surface = surface_types[format](sink,
+                *map(to_points, _default_page_size(label_type, size)))
+    surface.finish()
+    return stats
+
+def render_manifest(records, sink, **kwargs):
+    return render_batch(None, records, sink, **kwargs)
+
+__all__ = ("label_types", "get_label", "render_batch", "render_manifest",
+        "BatchStats")
@@ -4,7 +4,7 @@ from kltrack.label.base import *
 
 from gi.repository import Pango, PangoCairo
 
-class KLTLabel(object):
+class KLTLabel(BaseLabel):
     width = 210000
     height = 74000
     def __init__(self):
@@ -22,18 +22,31 @@ class KLTLabel(object):
                 (TextField(0, 59000, 105000, 15000, '(15) Packstück-Nr. (S)'), None),
                 (TextField(105000, 59000, 105000, 15000, '(16) Chargen-Nr. (H)'), None)
         ]
+        self.frame = Frame.from_fields(field_obj for field_obj, field_name in self.fields)
 
-    def render(self, ctx, data):
+    def render_chrome(self, ctx):
+        self.frame.render(ctx)
         for field_obj, field_name in self.fields:
             ctx.save()
             try:
-                field_obj.render(ctx)
+                ctx.translate(field_obj.position_x, field_obj.position_y)
+                field_obj.render(ctx, borders=False)
+            finally:
+                ctx.restore()
+
+    def render_data(self, ctx, data):
+        for field_obj, field_name in self.fields:
+            ctx.save()
+            try:
+                ctx.translate(field_obj.position_x, field_obj.position_y)
                 if field_name in data:
                     field_obj.render_data(ctx, data[field_name])
             finally:
                 ctx.restore()
 
-class GTLKLTLabel(object):
+class GTLKLTLabel(BaseLabel):
+    width = 210_000
+    height = 74_000
     fields = [
         BaseField(5_000, 2_000, 43_000 - 5_000, 21_500 - 2_000),
         BaseField(43_000, 2_000, 101_500 - 43_000, 21_500 - 2_000),
@@ -47,14 +60,10 @@ class GTLKLTLabel(object):
         BaseField(5_000, 46_000, 107_000 - 5_000, 74_000 - 5_000 - 46_000),
         BaseField(107_000, 46_000, 210_000 - 5_000 - 107_000, 74_000 - 5_000 - 46_000)
     ]
+    # The fields have no captions, so the frame is all there is to draw.
+    frame = Frame.from_fields(fields)
 
-    def render(self, ctx, data=None):
-        for field in self.fields:
-            ctx.save()
-            try:
-                ctx.translate(field.position_x, field.position_y)
-                field.render(ctx)
-            finally:
-                ctx.restore()
+    def render_chrome(self, ctx):
+        self.frame.render(ctx)
 
 __all__ = ("KLTLabel", 'GTLKLTLabel')
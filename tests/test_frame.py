@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("cairo")
+pytest.importorskip("gi")
+
+from kltrack.label.base import BaseField, Frame, _merge_intervals
+from kltrack.label.vda import GTLKLTLabel, KLTLabel
+
+class RecordingContext(object):
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name, args))
+
+def test_merge_intervals():
+    assert _merge_intervals([(5, 10), (0, 5)]) == [[0, 10]]
+    assert _merge_intervals([(0, 6), (4, 10), (2, 3)]) == [[0, 10]]
+    assert _merge_intervals([(0, 4), (6, 10)]) == [[0, 4], [6, 10]]
+
+def test_shared_edge():
+    frame = Frame()
+    frame.add_rectangle(0, 0, 10, 10, 100)
+    frame.add_rectangle(10, 0, 10, 10, 100)
+    assert sorted(frame.paths[100]) == sorted([
+        (0, 0, 20, 0), (0, 10, 20, 10),
+        (0, 0, 0, 10), (10, 0, 10, 10), (20, 0, 20, 10)])
+
+def test_overlapping_and_gaps():
+    frame = Frame()
+    frame.add_line(0, 0, 6, 0, 100)
+    frame.add_line(10, 0, 4, 0, 100)
+    frame.add_line(12, 0, 15, 0, 100)
+    frame.add_line(3, 3, 5, 5, 100)
+    frame.add_line(3, 3, 5, 5, 100)
+    assert frame.paths[100] == [(0, 0, 10, 0), (12, 0, 15, 0), (3, 3, 5, 5)]
+
+def test_line_widths_kept_apart():
+    frame = Frame()
+    frame.add_line(0, 0, 10, 0, 100)
+    frame.add_line(0, 0, 10, 0, 200)
+    assert frame.paths == {100: [(0, 0, 10, 0)], 200: [(0, 0, 10, 0)]}
+
+def test_single_stroke_per_width():
+    frame = Frame.from_fields([BaseField(0, 0, 10, 10), BaseField(10, 0, 10, 10),
+            BaseField(0, 10, 20, 5, show_borders=False)])
+    frame.add_line(0, 20, 20, 20, 200)
+    ctx = RecordingContext()
+    frame.render(ctx)
+    assert [name for name, args in ctx.calls].count("stroke") == 2
+    assert [name for name, args in ctx.calls].count("move_to") == 6
+
+@pytest.mark.parametrize("frame, lines", [(GTLKLTLabel.frame, 12), (KLTLabel().frame, 14)])
+def test_label_frames(frame, lines):
+    assert list(frame.paths) == [100]
+    assert len(frame.paths[100]) == lines
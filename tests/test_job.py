@@ -0,0 +1,90 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("cairo")
+pytest.importorskip("gi")
+pypdf = pytest.importorskip("pypdf")
+
+from kltrack.label.job import journal_name, read_journal
+
+repo_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+records = [{"id": f"KLT{i:05d}", "description": f"Behälter {i}", "copies": 1 + i % 2}
+        for i in range(2_000)]
+expected_pages = sum(record["copies"] for record in records)
+
+def job_command(tmp_path):
+    return [sys.executable, "-m", "kltrack.label",
+            "--json", str(tmp_path / "records.json"),
+            "--output-file", str(tmp_path / "out.pdf"),
+            "--job-dir", str(tmp_path / "job"),
+            "--segment-size", "20",
+            "barcode-62x29"]
+
+def journal_lines(tmp_path):
+    try:
+        with open(tmp_path / "job" / journal_name) as journal:
+            return journal.read().count("\n")
+    except FileNotFoundError:
+        return 0
+
+def test_resume_after_kill(tmp_path):
+    with open(tmp_path / "records.json", "w") as json_file:
+        json.dump(records, json_file)
+
+    process = subprocess.Popen(job_command(tmp_path), cwd=repo_dir)
+    try:
+        # The header and the first finished segment
+        deadline = time.monotonic() + 60
+        while journal_lines(tmp_path) < 2:
+            assert process.poll() is None, "job finished before it could be killed"
+            assert time.monotonic() < deadline, "job did not finish a segment in time"
+            time.sleep(0.01)
+        process.send_signal(signal.SIGKILL)
+    finally:
+        process.wait()
+    assert not (tmp_path / "out.pdf").exists()
+
+    header, segments = read_journal(tmp_path / "job")
+    assert segments
+    assert len(segments) < len(records) // 20
+    finished = {entry["file"]: os.stat(tmp_path / "job" / entry["file"]).st_mtime_ns
+            for entry in segments.values()}
+
+    subprocess.run(job_command(tmp_path), cwd=repo_dir, check=True)
+
+    for file_name, mtime in finished.items():
+        assert os.stat(tmp_path / "job" / file_name).st_mtime_ns == mtime
+    header, segments = read_journal(tmp_path / "job")
+    assert len(segments) == len(records) // 20
+    assert len(pypdf.PdfReader(tmp_path / "out.pdf").pages) == expected_pages
+
+def test_resume_with_other_parameters(tmp_path):
+    with open(tmp_path / "records.json", "w") as json_file:
+        json.dump(records[:40], json_file)
+    subprocess.run(job_command(tmp_path), cwd=repo_dir, check=True)
+
+    command = job_command(tmp_path)
+    command[-1] = "qr-54x17"
+    result = subprocess.run(command, cwd=repo_dir, capture_output=True, text=True)
+    assert result.returncode != 0
+    assert "Job parameters do not match" in result.stderr
+
+def test_counts_match_render_batch(tmp_path):
+    import io
+    from kltrack.label.job import render_job
+    from kltrack.label.render import render_batch
+
+    duplicates = [{"id": "A"}] * 5 + [{"id": "B"}, {"id": "B", "copies": 2}, {"id": "C"}]
+    job_stats = render_job("barcode-62x29", duplicates, tmp_path / "out.pdf",
+            tmp_path / "job", segment_size=2)
+    batch_stats = render_batch("barcode-62x29", duplicates, io.BytesIO())
+    assert (job_stats.records, job_stats.rendered, job_stats.duplicated) == \
+            (batch_stats.records, batch_stats.rendered, batch_stats.duplicated)
+    assert len(pypdf.PdfReader(tmp_path / "out.pdf").pages) == batch_stats.pages
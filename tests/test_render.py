@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+pytest.importorskip("cairo")
+pytest.importorskip("gi")
+pypdf = pytest.importorskip("pypdf")
+
+from kltrack.label.render import render_batch, to_points
+
+def render(label_type, records):
+    sink = io.BytesIO()
+    stats = render_batch(label_type, records, sink)
+    sink.seek(0)
+    return stats, pypdf.PdfReader(sink).pages
+
+def test_copies():
+    stats, pages = render("barcode-62x29", [{"id": "A", "copies": 3}])
+    assert (stats.records, stats.rendered, stats.duplicated) == (1, 1, 2)
+    assert len(pages) == stats.pages == 3
+
+def test_copies_from_command_line():
+    stats, pages = render("barcode-62x29", [{"id": "A", "copies": "2"}])
+    assert (stats.rendered, stats.duplicated) == (1, 1)
+    assert len(pages) == 2
+
+def test_zero_copies():
+    stats, pages = render("barcode-62x29", [{"id": "A", "copies": 0}, {"id": "B"}])
+    assert (stats.records, stats.rendered, stats.duplicated) == (2, 1, 0)
+    assert len(pages) == 1
+
+def test_consecutive_duplicates():
+    records = [{"id": "A"}, {"id": "A"}, {"id": "B"}, {"id": "A"}, {"id": "A", "copies": 2}]
+    stats, pages = render("barcode-62x29", records)
+    assert (stats.records, stats.rendered, stats.duplicated) == (5, 3, 3)
+    assert len(pages) == stats.pages == 6
+
+def test_size_change_after_copy_page():
+    records = [
+        {"label_type": "barcode-62x29", "id": "A", "copies": 2},
+        {"label_type": "barcode-54x17", "id": "A"}
+    ]
+    stats, pages = render(None, records)
+    assert (stats.rendered, stats.duplicated) == (2, 1)
+    widths = [round(float(page.mediabox.width), 1) for page in pages]
+    assert widths == [round(to_points(62_000), 1)] * 2 + [round(to_points(54_000), 1)]
+
+@pytest.mark.parametrize("copies", [-3, 2.9, True, "two", None])
+def test_invalid_copies(copies):
+    with pytest.raises(ValueError, match="Invalid number of copies in record 1"):
+        render_batch("barcode-62x29", [{"id": "A"}, {"id": "B", "copies": copies}], io.BytesIO())
+
+def test_size_field_is_data_with_label_type():
+    stats, pages = render("barcode-62x29", [{"id": "A", "size": "M"}, {"id": "B", "size": "a4"}])
+    assert stats.rendered == 2
+    assert {round(float(page.mediabox.width), 1) for page in pages} == {round(to_points(62_000), 1)}
+
+def test_invalid_record_writes_nothing():
+    sink = io.BytesIO()
+    with pytest.raises(ValueError, match="Unknown label type 'nope' in record 1"):
+        render_batch(None, [{"label_type": "barcode-62x29", "id": "A"},
+                {"label_type": "nope", "id": "B"}], sink)
+    assert sink.getvalue() == b""
+
+def test_manifest_without_label_type():
+    with pytest.raises(ValueError, match="No label type given for record 0"):
+        render_batch(None, [{"id": "A"}], io.BytesIO())